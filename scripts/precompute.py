@@ -0,0 +1,44 @@
+"""离线预计算三个阶段的指标和可视化HTML。
+
+三个阶段的数据是固定的静态文件，运行结果完全确定，没必要在每次部署后
+由第一个访问者承担计算成本。部署前（或CI里）跑一次：
+
+    python scripts/precompute.py
+
+会在 assets/ 下生成 phaseN.html 和 phaseN.json，streamlit_app 启动时
+优先读取它们，页面加载就只剩读文件。
+"""
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from streamlit_app import ASSETS_DIR, DATA_SOURCES, build_phase, phase_slug
+
+
+def main():
+    ASSETS_DIR.mkdir(exist_ok=True)
+    for phase_name in DATA_SOURCES:
+        slug = phase_slug(phase_name)
+        print(f'计算 {phase_name} ...')
+        # use_precomputed=False：重跑时必须完整计算，不能把旧资产读回来再写一遍
+        phase = build_phase(phase_name, use_precomputed=False)
+        if phase is None:
+            print(f'  {slug}: 数据加载失败，跳过')
+            continue
+        (ASSETS_DIR / f'{slug}.html').write_text(phase['html'], encoding='utf-8')
+        meta = {
+            'nodes': phase['nodes'],
+            'edges': phase['edges'],
+            'density': phase['density'],
+            'modularity': phase['modularity'],
+            'metrics': phase['metrics_df'].to_dict('records'),
+        }
+        (ASSETS_DIR / f'{slug}.json').write_text(
+            json.dumps(meta, ensure_ascii=False), encoding='utf-8')
+        print(f'  -> assets/{slug}.html, assets/{slug}.json')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,31 @@
+import hashlib
+import json
+import pickle
+from functools import lru_cache
+from pathlib import Path
+
 import streamlit as st
 import pandas as pd
 import networkx as nx
-from pyvis.network import Network
-import community.community_louvain as community_louvain
-import matplotlib.pyplot as plt
-import matplotlib.colors as mcolors
 import streamlit.components.v1 as components
 
+# pyvis和matplotlib只在渲染函数里按需导入，冷启动先把页面骨架画出来
+
+try:
+    import igraph  # C实现的图算法库，比纯Python的networkx快1-2个数量级
+except ImportError:
+    igraph = None
+
+try:
+    import leidenalg  # Leiden比Louvain更快，且不会产生内部不连通的社群
+except ImportError:
+    leidenalg = None
+
+try:
+    import nx_parallel  # networkx可插拔并行后端：装上后backend='parallel'即生效
+except ImportError:
+    nx_parallel = None
+
 
 st.set_page_config(
     page_title="贾宝玉社会网络演变分析",
@@ -75,11 +94,62 @@ DATA_SOURCES = {
     }
 }
 
-@st.cache_data
+# scripts/precompute.py 生成的静态结果目录；存在时直接读取，省去全部在线计算
+ASSETS_DIR = Path(__file__).parent / 'assets'
+# enableStaticServing 开启后，static/ 下的文件由浏览器按URL直接拉取
+STATIC_DIR = Path(__file__).parent / 'static'
+# 跨进程/跨重启的落盘结果缓存（按数据指纹命名）
+CACHE_DIR = Path(__file__).parent / 'cache'
+
+def render_network_html(html_data, height=620):
+    """优先把HTML落成静态文件走iframe（浏览器可缓存，不占websocket），失败则内联。"""
+    try:
+        STATIC_DIR.mkdir(exist_ok=True)
+        digest = hashlib.blake2b(html_data.encode('utf-8'), digest_size=8).hexdigest()
+        html_file = STATIC_DIR / f'net_{digest}.html'
+        if not html_file.exists():
+            html_file.write_text(html_data, encoding='utf-8')
+        components.iframe(f'app/static/{html_file.name}', height=height)
+    except OSError:
+        components.html(html_data, height=height)
+
+def phase_slug(phase_name):
+    # "Phase 1: 天真少年 (19-23回)" -> "phase1"
+    return phase_name.split(':')[0].lower().replace(' ', '')
+
+def _precomputed_available(slug):
+    return (ASSETS_DIR / f'{slug}.html').exists() and (ASSETS_DIR / f'{slug}.json').exists()
+
+def _load_precomputed(slug):
+    html_path = ASSETS_DIR / f'{slug}.html'
+    json_path = ASSETS_DIR / f'{slug}.json'
+    if not _precomputed_available(slug):
+        return None
+    meta = json.loads(json_path.read_text(encoding='utf-8'))
+    return {
+        'nodes': meta['nodes'],
+        'edges': meta['edges'],
+        'density': meta['density'],
+        'modularity': meta['modularity'],
+        'metrics_df': pd.DataFrame(meta['metrics']),
+        'html': html_path.read_text(encoding='utf-8'),
+    }
+
+def _read_csv(url, keep):
+    # pyarrow引擎是多线程C++解析，比默认C引擎快；装不上时退回默认引擎
+    try:
+        df = pd.read_csv(url, engine='pyarrow')
+    except (ImportError, ValueError):
+        df = pd.read_csv(url)
+    # Gephi导出常带Type/Kind等额外列，只留建图要用的
+    df = df.rename(columns=str.lower)
+    return df[[c for c in df.columns if c in keep]]
+
+@st.cache_data(ttl=3600, show_spinner=False)
 def load_data(edges_url, nodes_url):
     try:
-        edges_df = pd.read_csv(edges_url)
-        nodes_df = pd.read_csv(nodes_url)
+        edges_df = _read_csv(edges_url, {'source', 'target', 'weight'})
+        nodes_df = _read_csv(nodes_url, {'id', 'label'})
         return edges_df, nodes_df
     except Exception as e:
         st.error(f"数据加载失败: {e}")
@@ -87,73 +157,314 @@ def load_data(edges_url, nodes_url):
 
 def create_graph(edges_df, nodes_df):
     G = nx.Graph()
-    for _, row in nodes_df.iterrows():
-        node_id = row.get('Id') or row.get('id')
-        label = row.get('Label') or row.get('label') or str(node_id)
-        G.add_node(node_id, label=label, title=label)
-    for _, row in edges_df.iterrows():
-        src = row.get('Source') or row.get('source')
-        tgt = row.get('Target') or row.get('target')
-        w = row.get('Weight') or row.get('weight') or 1
-        if src in G.nodes and tgt in G.nodes:
-            G.add_edge(src, tgt, weight=w)
+    # 统一列名大小写（Gephi导出的CSV可能是Id/Label/Source/Target/Weight）
+    nodes_df = nodes_df.rename(columns=str.lower)
+    edges_df = edges_df.rename(columns=str.lower)
+    if 'label' not in nodes_df.columns:
+        nodes_df['label'] = nodes_df['id']
+    if 'weight' not in edges_df.columns:
+        edges_df['weight'] = 1
+    edges_df['weight'] = edges_df['weight'].fillna(1).astype('float32')
+
+    # 把节点ID（可能是中文名字符串）因子化成紧凑的int32编码：
+    # 后续所有SSSP/Louvain遍历都在小整数上做哈希，展示仍走label属性
+    uniques = pd.concat(
+        [nodes_df['id'], edges_df['source'], edges_df['target']], ignore_index=True
+    ).drop_duplicates()
+    id_code = {v: i for i, v in enumerate(uniques)}
+    nodes_df['id'] = nodes_df['id'].map(id_code).astype('int32')
+    edges_df['source'] = edges_df['source'].map(id_code).astype('int32')
+    edges_df['target'] = edges_df['target'].map(id_code).astype('int32')
+
+    G.add_nodes_from(
+        (i, {'label': l, 'title': l})
+        for i, l in zip(nodes_df['id'].to_numpy(), nodes_df['label'].astype(str).to_numpy())
+    )
+    # 用向量化的isin过滤非法边，替代逐行的 `in G.nodes` 检查
+    node_set = set(nodes_df['id'])
+    valid = edges_df['source'].isin(node_set) & edges_df['target'].isin(node_set)
+    G.add_weighted_edges_from(
+        edges_df.loc[valid, ['source', 'target', 'weight']].itertuples(index=False, name=None))
     return G
 
-def calculate_metrics(G):
-    density = nx.density(G)
-    degree_dict = nx.degree_centrality(G)
-    betweenness_dict = nx.betweenness_centrality(G, weight='weight')
-    partition = community_louvain.best_partition(G, weight='weight')
-    modularity_score = community_louvain.modularity(partition, G)
+def _uniform_weights(G):
+    # 所有边等权时最短路退化成BFS，不必走带堆的Dijkstra
+    weights = {w for _, _, w in G.edges(data='weight', default=1)}
+    return len(weights) <= 1
+
+def _betweenness_chunk(G, sources, weight):
+    # 子进程里跑一批源点的Brandes部分依赖分（需为模块级函数才能pickle）
+    return nx.betweenness_centrality_subset(
+        G, sources=sources, targets=list(G), normalized=False, weight=weight)
+
+def _betweenness_parallel(G, ex, workers, weight):
+    """没有igraph时的退路：把Brandes的源点切块分给进程池再求和。"""
+    nodes = list(G)
+    n = len(nodes)
+    chunks = [nodes[i::workers] for i in range(workers)]
+    result = {node: 0.0 for node in G}
+    for partial in ex.map(_betweenness_chunk, [G] * workers, chunks, [weight] * workers):
+        for node, value in partial.items():
+            result[node] += value
+    scale = 2.0 / ((n - 1) * (n - 2)) if n > 2 else 1.0
+    return {node: value * scale for node, value in result.items()}
+
+def _betweenness_component(G, nodes, weight):
+    # 单个连通分量的非归一化介数（子进程worker）
+    return nx.betweenness_centrality(G.subgraph(nodes).copy(), normalized=False, weight=weight)
+
+def _betweenness_by_component(G, ex, comps, weight):
+    """介数在连通分量间相互独立，分量级并行后统一按全图规模归一化。"""
+    n = G.number_of_nodes()
+    result = {node: 0.0 for node in G}  # <3个点的分量介数恒为0
+    futures = [ex.submit(_betweenness_component, G, comp, weight)
+               for comp in comps if len(comp) >= 3]
+    scale = 2.0 / ((n - 1) * (n - 2)) if n > 2 else 1.0
+    for future in futures:
+        for node, value in future.result().items():
+            result[node] = value * scale
+    return result
+
+def _to_igraph(G):
+    return igraph.Graph.TupleList(G.edges(data='weight'), weights=True, directed=False)
+
+def _betweenness_igraph(G, g):
+    """用igraph的C实现算介数中心性，结果归一化成networkx的口径。"""
+    n = G.number_of_nodes()
+    scale = 2.0 / ((n - 1) * (n - 2)) if n > 2 else 1.0
+    raw = g.betweenness(weights='weight', directed=False)
+    result = {node: 0.0 for node in G}  # 孤立节点不在边表里，介数为0
+    result.update({v['name']: raw[i] * scale for i, v in enumerate(g.vs)})
+    return result
+
+def approx_betweenness(G, k=None, seed=42, weight='weight'):
+    """源点抽样近似介数（Bader et al.）：代价O(k·M)，top-k排名在期望上不变。
+
+    直接用networkx内置的k参数做抽样，放大与归一化都由库内处理。
+    """
+    n = G.number_of_nodes()
+    if k is None:
+        k = min(n, max(32, int(n ** 0.5 * 4)))
+    return nx.betweenness_centrality(G, k=k, seed=seed, normalized=True, weight=weight)
+
+def _fill_isolated(partition, G):
+    # 孤立节点不在边表里，各自成一个社群（与python-louvain口径一致）
+    next_community = max(partition.values(), default=-1) + 1
+    for node in G:
+        if node not in partition:
+            partition[node] = next_community
+            next_community += 1
+    return partition
+
+def _partition_leiden(G, g):
+    """Leiden社群划分（C实现），比Louvain更快且社群保证内部连通。"""
+    part = leidenalg.find_partition(
+        g, leidenalg.ModularityVertexPartition, weights='weight', seed=0)
+    partition = {v['name']: part.membership[i] for i, v in enumerate(g.vs)}
+    # part.modularity不带边权，按带权口径重算，与其他档位一致
+    return _fill_isolated(partition, G), g.modularity(part.membership, weights='weight')
+
+def _partition_multilevel(G, g):
+    """igraph的C版Louvain：装了igraph但没装leidenalg时的中间档。"""
+    part = g.community_multilevel(weights='weight')
+    partition = {v['name']: part.membership[i] for i, v in enumerate(g.vs)}
+    return _fill_isolated(partition, G), g.modularity(part.membership, weights='weight')
+
+def _partition_louvain_nx(G):
+    """最后一档：networkx≥3.0自带的Louvain（带边数缓存和增量ΔQ优化）。"""
+    comms = nx.community.louvain_communities(G, weight='weight', seed=42)
+    partition = {node: i for i, c in enumerate(comms) for node in c}
+    return partition, nx.community.modularity(G, comms, weight='weight')
+
+def calculate_metrics(G, approximate=False):
+    n = G.number_of_nodes()
+    m = G.number_of_edges()
+    density = 2 * m / (n * (n - 1)) if n > 1 else 0.0
+    if n < 2 or m == 0:
+        # 空图/单点/无边CSV：所有指标都是平凡值，不必启动任何算法
+        degree_dict = {node: 0.0 for node in G}
+        betweenness_dict = {node: 0.0 for node in G}
+        partition = {node: i for i, node in enumerate(G)}
+        modularity_score = 0.0
+    else:
+        degree_dict = nx.degree_centrality(G)
+        g = _to_igraph(G) if igraph is not None else None
+        if g is not None:
+            # igraph的C调用只占几毫秒，串行跑即可
+            betweenness_dict = approx_betweenness(G) if approximate else _betweenness_igraph(G, g)
+            if leidenalg is not None:
+                partition, modularity_score = _partition_leiden(G, g)
+            else:
+                partition, modularity_score = _partition_multilevel(G, g)
+        else:
+            # 纯Python路径：介数与Louvain互相独立，放进同一个进程池并行跑
+            import os
+            from concurrent.futures import ProcessPoolExecutor
+            workers = min(os.cpu_count() or 1, 4)
+            weight = None if _uniform_weights(G) else 'weight'
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                f_louvain = ex.submit(_partition_louvain_nx, G)
+                if approximate or n > 1000:
+                    # 千节点以上精确介数即便并行也要数十秒，自动切抽样近似
+                    betweenness_dict = approx_betweenness(G, weight=weight)
+                elif nx_parallel is not None and n >= 200:
+                    # 官方并行后端在：joblib按源点分发，结果与串行逐位一致
+                    betweenness_dict = nx.betweenness_centrality(
+                        G, weight=weight, backend='parallel')
+                elif n >= 200 and workers > 1:
+                    # 像第三阶段这种可能碎成多个分量的网络，按分量并行更划算
+                    comps = list(nx.connected_components(G))
+                    if len(comps) > 1:
+                        betweenness_dict = _betweenness_by_component(G, ex, comps, weight)
+                    else:
+                        betweenness_dict = _betweenness_parallel(G, ex, max(workers - 1, 1), weight)
+                else:
+                    betweenness_dict = nx.betweenness_centrality(G, weight=weight)
+                partition, modularity_score = f_louvain.result()
     
-    nx.set_node_attributes(G, degree_dict, 'degree_centrality')
-    nx.set_node_attributes(G, betweenness_dict, 'betweenness_centrality')
-    nx.set_node_attributes(G, partition, 'group')
-    return G, density, modularity_score, degree_dict, betweenness_dict, partition
+    # 不回写节点属性：G是cache_resource共享对象，原地修改会让并发会话互相踩
+    return G, n, m, density, modularity_score, degree_dict, betweenness_dict, partition
+
+# 空DataSet在PyVis模板里的样子；nodes在前、edges在后，各出现一次
+_DATASET_MARKER = 'new vis.DataSet([])'
 
-def visualize_network(G, partition):
+def _empty_network():
+    from pyvis.network import Network
     net = Network(height="600px", width="100%", bgcolor="#ffffff", font_color="black")
-    unique_communities = list(set(partition.values()))
+    net.toggle_physics(False)
+    return net
+
+@lru_cache(maxsize=1)
+def _pyvis_shell():
+    """渲染一次空网络，复用含~200KB vis.js的HTML外壳，之后只注入数据JSON。"""
+    return _empty_network().generate_html(notebook=False)
+
+def community_color_map(partition):
+    import matplotlib.colors as mcolors
+    # 按社群编号排序再配色，保证重跑/改数据后同一社群拿到同一颜色
     colors = list(mcolors.TABLEAU_COLORS.values())
-    color_map = {com: colors[i % len(colors)] for i, com in enumerate(unique_communities)}
-    
-    for node_id in G.nodes:
-        node = G.nodes[node_id]
-        size = node['degree_centrality'] * 30 + 10
-        group_id = node['group']
-        color = color_map.get(group_id, "#97C2FC")
-        title_html = f"<b>{node['label']}</b><br>Degree: {node['degree_centrality']:.3f}<br>Betweenness: {node['betweenness_centrality']:.3f}<br>Group: {group_id}"
-        net.add_node(node_id, label=node['label'], title=title_html, size=size, color=color, group=group_id)
-
-    for u, v, data in G.edges(data=True):
-        weight = data.get('weight', 1)
-        net.add_edge(u, v, value=weight, color="#cccccc")
-
-    net.force_atlas_2based(
-        gravity=-50,
-        central_gravity=0.01,
-        spring_length=100,
-        spring_strength=0.08,
-        damping=0.4,
-        overlap=0
-    )
-    
+    return {com: colors[i % len(colors)]
+            for i, com in enumerate(sorted(set(partition.values())))}
+
+def visualize_network(G, degree, betweenness, partition, color_map):
+    # 指标直接从计算结果dict取，不经过（共享的）图对象的节点属性
+    labels = dict(G.nodes(data='label'))
+    snapshot = [
+        (node_id, labels[node_id], degree[node_id], betweenness[node_id], partition[node_id])
+        for node_id in G.nodes
+    ]
+    # 布局在服务器端算好一次（随流水线一起缓存），浏览器不再跑物理模拟
+    pos = nx.spring_layout(G, weight='weight', seed=42)
+    vis_nodes = [
+        {'id': int(node_id), 'label': label, 'shape': 'dot',
+         'title': f"<b>{label}</b><br>Degree: {deg:.3f}<br>Betweenness: {bw:.3f}<br>Group: {group_id}",
+         'size': deg * 30 + 10, 'color': color_map.get(group_id, "#97C2FC"),
+         'group': int(group_id),
+         'x': float(pos[node_id][0]) * 1000, 'y': float(pos[node_id][1]) * 1000,
+         'physics': False}
+        for node_id, label, deg, bw, group_id in snapshot
+    ]
+    vis_edges = [
+        {'from': int(u), 'to': int(v), 'value': float(w), 'color': "#cccccc"}
+        for u, v, w in G.edges(data='weight', default=1)
+    ]
+
+    shell = _pyvis_shell()
+    if shell.count(_DATASET_MARKER) == 2:
+        # 只为数据付字符串拼接的钱，vis.js外壳三个阶段共用同一份
+        html = shell.replace(_DATASET_MARKER,
+                             f'new vis.DataSet({json.dumps(vis_nodes, ensure_ascii=False)})', 1)
+        return html.replace(_DATASET_MARKER,
+                            f'new vis.DataSet({json.dumps(vis_edges, ensure_ascii=False)})', 1)
+    # PyVis模板结构变了：把现成的列表直接挂到net上，跳过逐节点校验
+    net = _empty_network()
+    net.nodes = vis_nodes
+    net.edges = vis_edges
+    return net.generate_html(notebook=False)
+
+@st.cache_resource(ttl=3600, show_spinner=False)
+def build_graph(edges_url, nodes_url):
+    """图对象是不可变的纯Python结构，用cache_resource免去每次取用的pickle拷贝。"""
+    edges_df, nodes_df = load_data(edges_url, nodes_url)
+    if edges_df is None or nodes_df is None:
+        return None
+    return create_graph(edges_df, nodes_df)
+
+def _graph_digest(G):
+    # 图内容的稳定指纹：节点标签 + 带权边表
+    payload = repr(sorted(G.nodes(data='label'))) + repr(sorted(G.edges(data='weight')))
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=8).hexdigest()
+
+def _disk_cache_load(path):
     try:
-        path = "/tmp"
-        net.save_graph(f'pyvis_graph.html')
-        HtmlFile = open(f'pyvis_graph.html', 'r', encoding='utf-8')
-        return HtmlFile.read()
-    except:
-        net.save_graph('pyvis_graph.html')
-        HtmlFile = open('pyvis_graph.html', 'r', encoding='utf-8')
-        return HtmlFile.read()
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError):
+        return None
+
+def _disk_cache_store(path, result):
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        with open(path, 'wb') as f:
+            pickle.dump(result, f)
+    except OSError:
+        pass  # 只读文件系统等情况下放弃落盘，不影响结果
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def build_phase(phase_name, approximate=False, use_precomputed=True):
+    """跑完某一阶段的完整流水线（建图+指标+可视化），结果按阶段缓存。
+
+    use_precomputed=False强制走完整计算（precompute脚本用，避免把旧资产读回来）。
+    """
+    if use_precomputed:
+        precomputed = _load_precomputed(phase_slug(phase_name))
+        if precomputed is not None:
+            return precomputed
+    source = DATA_SOURCES[phase_name]
+    G = build_graph(source['edges'], source['nodes'])
+    if G is None:
+        return None
+    # st.cache_data只活在进程内；按数据指纹再落一份盘上缓存，重启后冷启动只剩读文件
+    cache_file = CACHE_DIR / f'{phase_slug(phase_name)}_{_graph_digest(G)}_{int(approximate)}.pkl'
+    cached = _disk_cache_load(cache_file)
+    if cached is not None:
+        return cached
+    G, n, m, density, modularity, degree, betweenness, partition = calculate_metrics(
+        G, approximate=approximate)
+    html_data = visualize_network(
+        G, degree, betweenness, partition, community_color_map(partition))
+    # 标签遍历一次，三个指标列直接由已算好的dict向量化对齐填充
+    nodes = list(G.nodes)
+    labels = dict(G.nodes(data='label'))
+    metrics_df = pd.DataFrame({
+        'Character': [labels[n] for n in nodes],
+        'Degree (影响力)': pd.Series(degree).reindex(nodes).to_numpy(),
+        'Betweenness (桥接能力)': pd.Series(betweenness).reindex(nodes).to_numpy(),
+        'Community (社群)': pd.Series(partition).reindex(nodes).to_numpy(),
+    })
+    result = {
+        'nodes': n,
+        'edges': m,
+        'density': density,
+        'modularity': modularity,
+        'metrics_df': metrics_df,
+        'html': html_data,
+    }
+    _disk_cache_store(cache_file, result)
+    return result
 
 def main():
     st.sidebar.title("📖 导航栏")
     st.sidebar.info("李子睿 CHC5904 Hands-on Assignment2")
     
     selected_phase = st.sidebar.selectbox("选择分析阶段", list(DATA_SOURCES.keys()))
-    
+    if _precomputed_available(phase_slug(selected_phase)):
+        # 该阶段走预计算资产（精确结果），近似开关不起作用，不渲染
+        approximate = False
+    else:
+        approximate = st.sidebar.checkbox("Approximate betweenness (fast)", value=False,
+                                          help="对介数中心性做源点抽样近似，大网络下更快；排名基本不变")
+
     st.sidebar.markdown("---")
     st.sidebar.subheader("Research Question")
     st.sidebar.markdown("""
@@ -166,21 +477,18 @@ def main():
     st.markdown(f"_{DATA_SOURCES[selected_phase]['desc']}_")
     
     with st.spinner('正在从GitHub加载数据并运行算法...'):
-        edges_url = DATA_SOURCES[selected_phase]['edges']
-        nodes_url = DATA_SOURCES[selected_phase]['nodes']
-        
-        edges_df, nodes_df = load_data(edges_url, nodes_url)
-        
-        if edges_df is not None and nodes_df is not None:
-            G = create_graph(edges_df, nodes_df)
-            G, density, modularity, degree, betweenness, partition = calculate_metrics(G)
-  
+        phase = build_phase(selected_phase, approximate=approximate)
+
+        if phase is not None:
             st.subheader("📊 网络整体指标 (Network Metrics)")
-            col1, col2, col3, col4 = st.columns(4)
-            col1.metric("Nodes (节点数)", G.number_of_nodes())
-            col2.metric("Edges (边数)", G.number_of_edges())
-            col3.metric("Density (密度)", f"{density:.4f}")
-            col4.metric("Modularity (模块化)", f"{modularity:.4f}")
+            summary = [
+                ("Nodes (节点数)", phase['nodes']),
+                ("Edges (边数)", phase['edges']),
+                ("Density (密度)", f"{phase['density']:.4f}"),
+                ("Modularity (模块化)", f"{phase['modularity']:.4f}"),
+            ]
+            for col, (label, value) in zip(st.columns(4), summary):
+                col.metric(label, value)
             
             with st.expander("指标解释 (Metric Definitions)"):
                 st.markdown("""
@@ -189,25 +497,19 @@ def main():
                 """)
 
             st.subheader("🕸️ 交互式网络可视化 (Interactive Visualization)")
-            st.markdown("节点大小 = 度中心性 | 节点颜色 = 社群 (Community) | 布局 = Force Atlas 2")
-            html_data = visualize_network(G, partition)
-            components.html(html_data, height=620)
- 
+            st.markdown("节点大小 = 度中心性 | 节点颜色 = 社群 (Community) | 布局 = 服务器端预计算的力导向布局")
+            render_network_html(phase['html'])
+
             st.subheader("🔍 核心人物分析 (Centrality Analysis)")
-            metrics_df = pd.DataFrame({
-                'Character': [G.nodes[n]['label'] for n in G.nodes],
-                'Degree (影响力)': [degree[n] for n in G.nodes],
-                'Betweenness (桥接能力)': [betweenness[n] for n in G.nodes],
-                'Community (社群)': [partition[n] for n in G.nodes]
-            }).sort_values(by='Degree (影响力)', ascending=False)
-            
+            metrics_df = phase['metrics_df']
+
             c1, c2 = st.columns(2)
             with c1:
                 st.markdown("**影响力排名 (Top by Degree)**")
-                st.dataframe(metrics_df[['Character', 'Degree (影响力)']].head(10), use_container_width=True)
+                st.dataframe(metrics_df.nlargest(10, 'Degree (影响力)')[['Character', 'Degree (影响力)']], use_container_width=True)
             with c2:
                 st.markdown("**中介能力排名 (Top by Betweenness)**")
-                st.dataframe(metrics_df.sort_values(by='Betweenness (桥接能力)', ascending=False)[['Character', 'Betweenness (桥接能力)']].head(10), use_container_width=True)
+                st.dataframe(metrics_df.nlargest(10, 'Betweenness (桥接能力)')[['Character', 'Betweenness (桥接能力)']], use_container_width=True)
             
             st.markdown("---")
             st.subheader("📝 阶段性深度反思 (Phase Reflection)")